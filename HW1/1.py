@@ -1,26 +1,166 @@
+import heapq
+import sys
+from collections import OrderedDict
+from fractions import Fraction
+from multiprocessing import Pool
 
-def djk(adjacency_list, initial_distances, destination, parents=None, coeff=1, compare_with=None):
+import numpy as np
+
+from dynamic_sssp import DynamicField
+
+INF = 1e18
+
+
+class CSRGraph:
+    def __init__(self, offsets, neighbours, weights):
+        self.offsets = offsets
+        self.neighbours = neighbours
+        self.weights = weights
+
+    @classmethod
+    def from_edges(cls, n, us, vs, ws):
+        # every undirected edge is stored in both directions, in input order
+        src = np.stack([us, vs], axis=1).ravel()
+        dst = np.stack([vs, us], axis=1).ravel()
+        wgt = np.repeat(ws, 2)
+
+        order = np.argsort(src, kind='stable')
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+        return cls(offsets, dst[order].astype(np.int32), wgt[order])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, v):
+        a, b = self.offsets[v], self.offsets[v + 1]
+        return zip(self.neighbours[a:b].tolist(), self.weights[a:b].tolist())
+
+
+def read_cases(stream=None):
+    data = np.array((stream or sys.stdin.buffer).read().split(), dtype=np.int64)
+    pos = 0
+
+    def take(k):
+        nonlocal pos
+        pos += k
+        return data[pos - k:pos]
+
+    K = int(take(1)[0])
+    for _ in range(K):
+        n, m = map(int, take(2))
+        edges = take(3 * m).reshape(m, 3)
+        graph = CSRGraph.from_edges(n, edges[:, 0] - 1, edges[:, 1] - 1, edges[:, 2])
+
+        T = int(take(1)[0])
+        criminals = (take(T) - 1).tolist()
+
+        C = int(take(1)[0])
+        cars = (take(C) - 1).tolist()
+
+        s, g = (take(2) - 1).tolist()
+        yield n, graph, criminals, cars, s, g
+
+
+class RadixHeap:
+    # monotone integer priority queue: keys pushed are never below the last popped key
+    def __init__(self):
+        self.last = 0
+        self.size = 0
+        self.buckets = [[] for _ in range(65)]
+
+    def __len__(self):
+        return self.size
+
+    def push(self, entry):
+        self.buckets[(entry[0] ^ self.last).bit_length()].append(entry)
+        self.size += 1
+
+    def pop(self):
+        if not self.buckets[0]:
+            i = 1
+            while not self.buckets[i]:
+                i += 1
+            bucket = self.buckets[i]
+            self.buckets[i] = []
+            self.last = min(entry[0] for entry in bucket)
+            for entry in bucket:
+                self.buckets[(entry[0] ^ self.last).bit_length()].append(entry)
+        self.size -= 1
+        return self.buckets[0].pop()
+
+
+class Landmarks:
+    def __init__(self, graph, k, start=0):
+        # farthest-point selection: each new landmark is the node farthest from the chosen ones
+        n = len(graph)
+        self.nodes = []
+        self.tables = []
+        closest = [INF] * n
+        v = start
+        for _ in range(min(k, n)):
+            table, _, _ = djk(graph, initial_distances=[0 if i == v else INF for i in range(n)], destination=None)
+            self.nodes.append(v)
+            self.tables.append(table)
+            closest = [min(a, b) for a, b in zip(closest, table)]
+            v = max(range(n), key=lambda i: closest[i] if closest[i] < INF else -1)
+            if closest[v] == 0:
+                break
+
+    def heuristic(self, destination, coeff=1):
+        # triangle inequality: |d(l, g) - d(l, v)| <= d(v, g) for every landmark l
+        to_goal = [(table, table[destination]) for table in self.tables]
+
+        def h(v):
+            return coeff * max((abs(dg - table[v]) for table, dg in to_goal), default=0)
+
+        return h
+
+
+def djk(adjacency_list, initial_distances, destination, parents=None, coeff=1, compare_with=None, landmarks=None, queue='heap'):
 
     distances = initial_distances.copy()
 
-    fringe = set()
-    for i in range(len(initial_distances)):
-        fringe.add((distances[i], i))
+    # a* mode when landmarks are given, plain dijkstra otherwise
+    if landmarks and destination is not None:
+        h = landmarks.heuristic(destination, coeff)
+    else:
+        h = lambda v: 0
+
+    # lazy deletion: stale (key, g, v) entries are skipped when popped
+    if queue == 'radix':
+        # needs integer weights and initial distances; coeff=1/2 stays integral once keys are doubled
+        scale = Fraction(coeff).limit_denominator().denominator
+        key = lambda f: int(f * scale)
+        fringe = RadixHeap()
+        push, pop = fringe.push, fringe.pop
+    else:
+        key = lambda f: f
+        push = lambda entry: heapq.heappush(fringe, entry)
+        pop = lambda: heapq.heappop(fringe)
+
+    entries = [(key(g + h(i)), g, i) for i, g in enumerate(distances) if g < INF]
+    if queue == 'radix':
+        for entry in entries:
+            push(entry)
+    else:
+        fringe = entries
+        heapq.heapify(fringe)
 
     while fringe:
-        g, v = min(fringe)
-        fringe.remove((g, v))
+        _, g, v = pop()
+        if g > distances[v]:
+            continue
 
         if v == destination:
             break
 
         for u, w in adjacency_list[v]:
-            if distances[v] + w * coeff < distances[u]:
-                fringe.remove((distances[u], u))
-                distances[u] = distances[v] + w * coeff
+            if g + w * coeff < distances[u]:
+                distances[u] = g + w * coeff
                 if parents:
                     parents[u] = v
-                fringe.add((distances[u], u))
+                push((key(distances[u] + h(u)), distances[u], u))
                 
                 if compare_with and u == destination and distances[u] < compare_with:
                     return distances, parents, True
@@ -28,64 +168,155 @@ def djk(adjacency_list, initial_distances, destination, parents=None, coeff=1, c
     return distances, parents, False
 
 
-def main():
-    K = int(input())
-    for _ in range(K):
-        n, m = map(int, input().split())
-
-        adjacency_list = [[] for _ in range(n)]
-        for i in range(m):
-            u, v, g = map(int, input().split())
-            u -= 1
-            v -= 1
-            adjacency_list[u].append((v, g))
-            adjacency_list[v].append((u, g))
-
-
-        T = int(input())
-        temp = list(map(int, input().split()))
-        criminals = [a-1 for a in temp]
-
-        C = int(input())
-        temp = list(map(int, input().split()))
-        cars = [a-1 for a in temp]
-
-        s, g = map(int, input().split())
-        s -= 1
-        g -= 1
-
-        distances_from_tintin, parents, _ = djk(adjacency_list,
-        							initial_distances=[0 if i == s else 1e18 for i in range(n)], 
-        							parents=[-1 for _ in range(n)], 
-        							destination=g)
-
-
-        distances_from_criminals, _, found_tintin = djk(adjacency_list, 
-        								initial_distances=[0 if i in criminals else 1e18 for i in range(n)], 
-        								destination=g, 
-        								compare_with=distances_from_tintin[g])
-        
-        if not found_tintin:
-            initial_car_distnaces = [g if i in cars else 1e18 for i, g in enumerate(distances_from_criminals)]
-            distances_from_bs, _, found_tintin = djk(adjacency_list,
-            								initial_distances=initial_car_distnaces, 
-        									coeff=1/2, 
-        									destination=g, 
-        									compare_with=distances_from_tintin[g])
-
-
-        if found_tintin or distances_from_tintin[g] > min(distances_from_criminals[g], distances_from_bs[g]):
-            print("Poor Tintin")
-        else:
-            print(distances_from_tintin[g])
-            path = [g+1]
-            while g != s:
-                g = parents[g]
-                path.append(g+1)
-            
-            print(len(path))
-            print(*path[::-1])
+TINTIN, ON_FOOT, IN_CAR = 0, 1, 2
+
+
+def pursuit(graph, s, g, criminals, cars):
+    # one search over three layers: Tintin, criminals on foot and criminals in a car.
+    # at equal time Tintin's entry pops first, so ties go to him like in the old verdict.
+    distances = ({s: 0}, {}, {})
+    parents = {s: -1}
+
+    fringe = [(0, TINTIN, s)]
+    for c in criminals:
+        distances[ON_FOOT][c] = 0
+        fringe.append((0, ON_FOOT, c))
+    heapq.heapify(fringe)
+
+    while fringe:
+        d, layer, v = heapq.heappop(fringe)
+        if d > distances[layer][v]:
+            continue
+
+        if v == g:
+            if layer == TINTIN:
+                return d, parents
+            return None, None
+
+        if layer == ON_FOOT and v in cars and d < distances[IN_CAR].get(v, INF):
+            distances[IN_CAR][v] = d
+            heapq.heappush(fringe, (d, IN_CAR, v))
+
+        coeff = 1/2 if layer == IN_CAR else 1
+        dist = distances[layer]
+        for u, w in graph[v]:
+            if d + w * coeff < dist.get(u, INF):
+                dist[u] = d + w * coeff
+                if layer == TINTIN:
+                    parents[u] = v
+                heapq.heappush(fringe, (dist[u], layer, u))
+
+    # g is unreachable from s: reported as Poor Tintin (the old djk runs printed 1e+18 and a bogus path)
+    return None, None
+
+
+class CityIndex:
+    def __init__(self, graph, criminals, cars):
+        self.graph = graph
+        self.criminals = set(criminals)
+        self.cars = set(cars)
+
+        self.on_foot = DynamicField(graph, {c: 0 for c in self.criminals})
+        self.in_car = DynamicField(graph, self._car_seeds(), coeff=1/2)
+        self.arrival = [min(a, b) for a, b in zip(self.on_foot.distances, self.in_car.distances)]
+
+    def _car_seeds(self):
+        return {c: self.on_foot.distances[c] for c in self.cars if self.on_foot.distances[c] < INF}
+
+    def update(self, criminals, cars):
+        # repairs only the parts of the fields that depend on moved criminals or cars
+        old_key = (id(self.graph), frozenset(self.criminals), frozenset(self.cars))
+        criminals, cars = set(criminals), set(cars)
+
+        changed = set()
+        for c in self.criminals - criminals:
+            changed |= self.on_foot.remove_source(c)
+        for c in criminals - self.criminals:
+            changed |= self.on_foot.set_source(c, 0)
+        self.criminals, self.cars = criminals, cars
+
+        seeds = self._car_seeds()
+        for c in [c for c in self.in_car.seeds if c not in seeds]:
+            changed |= self.in_car.remove_source(c)
+        for c, d in seeds.items():
+            if self.in_car.seeds.get(c) != d:
+                changed |= self.in_car.set_source(c, d)
+
+        for v in changed:
+            self.arrival[v] = min(self.on_foot.distances[v], self.in_car.distances[v])
+
+        if _city_indexes.get(old_key) is self:
+            del _city_indexes[old_key]
+            _city_indexes[(id(self.graph), frozenset(criminals), frozenset(cars))] = self
+        return changed
+
+    def query(self, s, g, landmarks=None):
+        # only Tintin is searched; once the smallest key passes the criminals' arrival at g he has lost
+        limit = self.arrival[g]
+        h = landmarks.heuristic(g) if landmarks else lambda v: 0
+        distances = {s: 0}
+        parents = {s: -1}
+        fringe = [(h(s), 0, s)]
+        while fringe:
+            f, d, v = heapq.heappop(fringe)
+            if d > distances[v]:
+                continue
+            if f > limit:
+                break
+            if v == g:
+                return d, parents
+            for u, w in self.graph[v]:
+                if d + w < distances.get(u, INF):
+                    distances[u] = d + w
+                    parents[u] = v
+                    heapq.heappush(fringe, (d + w + h(u), d + w, u))
+        return None, None
+
+
+# least recently used indexes are dropped past CITY_INDEX_CACHE entries
+CITY_INDEX_CACHE = 16
+_city_indexes = OrderedDict()
+
+
+def city_index(graph, criminals, cars):
+    # the index keeps a reference to graph, so its id stays unique while cached
+    key = (id(graph), frozenset(criminals), frozenset(cars))
+    if key in _city_indexes:
+        _city_indexes.move_to_end(key)
+    else:
+        _city_indexes[key] = CityIndex(graph, criminals, cars)
+        if len(_city_indexes) > CITY_INDEX_CACHE:
+            _city_indexes.popitem(last=False)
+    return _city_indexes[key]
+
+
+def solve(case):
+    n, graph, criminals, cars, s, g = case
+    distance, parents = pursuit(graph, s, g, criminals, set(cars))
+
+    if distance is None:
+        return ["Poor Tintin"]
+
+    path = [g+1]
+    while g != s:
+        g = parents[g]
+        path.append(g+1)
+
+    return [str(distance), str(len(path)), ' '.join(map(str, path[::-1]))]
+
+
+def main(jobs=1):
+    if jobs > 1:
+        # cases are parsed up front; imap keeps results in input order
+        cases = list(read_cases())
+        with Pool(jobs) as pool:
+            results = pool.imap(solve, cases, chunksize=max(1, len(cases) // (jobs * 8)))
+            for lines in results:
+                print('\n'.join(lines))
+    else:
+        for case in read_cases():
+            print('\n'.join(solve(case)))
 
 
 if __name__ == '__main__':
-    main()
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1)
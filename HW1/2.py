@@ -1,9 +1,28 @@
 from __future__ import annotations
+import heapq
+import json
+import multiprocessing
+import os
+import pickle
+import queue
+import sys
+import time
+from contextlib import contextmanager
 from mimetypes import init
 from typing import List
 
 TILES = []
 DJK = False
+STRONG_HEURISTIC = False
+SEARCH = 'astar' # astar, ida, bounded (ida* with a transposition table of at most MEMORY_CAP states), hda or beam (anytime, TIME_LIMIT)
+MEMORY_CAP = 1000000
+WORKERS = os.cpu_count()
+WEIGHT = 1 # f = g + WEIGHT * h in every mode; above 1, a*, ida* and hda* answers cost at most WEIGHT times the optimum
+TIME_LIMIT = 10 # seconds for the anytime beam search
+BEAM_WIDTH = 16 # initial width, doubled after every pass
+PRUNE_DEAD_ENDS = False
+STATS_FILE = None # write a* search stats as json here
+STATS_EVERY = 0 # sample open/closed sizes every this many expansions
 
 class Tile:
     def __init__(self, u, r, d, l, i):
@@ -12,6 +31,7 @@ class Tile:
         self.d = d
         self.l = l
         self.index = i
+        self.bound = self.get_min()
 
     def __str__(self) -> str:
         return f"{self.index}: {self.u} {self.r} {self.d} {self.l}"
@@ -21,41 +41,52 @@ class Tile:
 
 
 class State:
+    # immutable board encoding: tuple of tile indices (-1 = empty) and a bitmask of unused tiles
+    __slots__ = ('n', 'm', 'board', 'unused', 'frontier', 'tile_counts', 'dist', 'heuristic', 'hash', 'counts')
+
     def __init__(self, n, m, prev_state:State=None, x=None, y=None, tile:Tile=None):
         self.n = n
         self.m = m
 
         if not prev_state:
-            self.table = [[None for _ in range(m)] for _ in range(n)]
+            self.board = (-1,) * (n * m)
             self.tile_counts = 0
             self.dist = 0
-            self.unused_tiles = TILES
+            self.unused = (1 << len(TILES)) - 1
+            self.frontier = frozenset()
         else:
-            self.table = [[t for t in row] for row in prev_state.table]
-            self.table[x][y] = tile
+            k = x * m + y
+            self.board = prev_state.board[:k] + (tile.index,) + prev_state.board[k+1:]
             self.tile_counts = prev_state.tile_counts + 1
             self.dist = 1e18
-            self.unused_tiles = [t for t in prev_state.unused_tiles if t != tile]
-
-        self.all_tiles = [item for sublist in self.table for item in sublist]
-
-        h = 0
-        for tile in self.unused_tiles:
-            h += tile.get_min()
+            self.unused = prev_state.unused & ~(1 << tile.index)
+            # empty cells touching a placed tile
+            self.frontier = (prev_state.frontier - {k}) | {
+                a * m + b for a, b in ((x-1, y), (x, y-1), (x+1, y), (x, y+1))
+                if 0 <= a < n and 0 <= b < m and self.board[a * m + b] < 0}
 
         if not prev_state:
-            h -= TILES[0].get_min()
-    
-        self.heuristic = h
+            self.heuristic = sum(t.bound for t in TILES) - TILES[0].bound
+        elif prev_state.is_table_empty():
+            # the initial tile is free and already left out of the root heuristic
+            self.heuristic = prev_state.heuristic
+        else:
+            self.heuristic = prev_state.heuristic - tile.bound
 
 
-        self.hash = hash(tuple(self.all_tiles))
+        self.hash = hash(self.board)
+        # per tile, how many empty cells it could still end up in (filled in by Game)
+        self.counts = None
     
     def is_table_empty(self):
         return not bool(self.tile_counts)
 
+    def get_tile(self, x, y):
+        i = self.board[x * self.m + y]
+        return TILES[i] if i >= 0 else None
+
     def get_tiles(self):
-        return self.all_tiles
+        return [TILES[i] if i >= 0 else None for i in self.board]
 
     def get_heuristic(self):
         return self.heuristic
@@ -64,36 +95,36 @@ class State:
         if DJK: # djk
             return self.dist
         else: # a*
-            return self.get_heuristic() + self.dist
+            return WEIGHT * self.get_heuristic() + self.dist
 
     def is_goal(self):
         return self.tile_counts == self.n * self.m
 
     def get_unused_tiles(self):
-        return self.unused_tiles
+        return [tile for tile in TILES if self.unused >> tile.index & 1]
 
     def get_insertion_cost(self, x, y, tile):
-        if self.table[x][y]:
+        if self.get_tile(x, y):
             return None, False
         
         ok_edges = []
         if x > 0: # up
-            next_tile = self.table[x-1][y]
+            next_tile = self.get_tile(x-1, y)
             if next_tile and next_tile.d == tile.u:
                 ok_edges.append(tile.u)
 
         if y > 0: # left
-            next_tile = self.table[x][y-1]
+            next_tile = self.get_tile(x, y-1)
             if next_tile and next_tile.r == tile.l:
                 ok_edges.append(tile.l)
 
         if x+1 < self.n: # down
-            next_tile = self.table[x+1][y]
+            next_tile = self.get_tile(x+1, y)
             if next_tile and next_tile.u == tile.d:
                 ok_edges.append(tile.d)
 
         if y+1 < self.m: # right
-            next_tile = self.table[x][y+1]
+            next_tile = self.get_tile(x, y+1)
             if next_tile and next_tile.l == tile.r:
                 ok_edges.append(tile.r)
 
@@ -103,7 +134,10 @@ class State:
         return min(ok_edges), True
 
     def __eq__(self, other) -> bool:
-        return self.hash == other.hash
+        return self.board == other.board
+
+    def __hash__(self):
+        return self.hash
     
     def __lt__(self, other):
         return self.get_f() < other.get_f()
@@ -112,12 +146,78 @@ class State:
         s = "-------------\n"
         for i in range(self.n):
             for j in range(self.m):
-                s += f"{'-' if not self.table[i][j] else self.table[i][j].index} "
+                tile = self.get_tile(i, j)
+                s += f"{'-' if not tile else tile.index} "
             s += "\n"
         s += "-------------\n"
         return s
         
 
+class SearchStats:
+    def __init__(self, sample_every=0):
+        self.sample_every = sample_every
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.samples = []
+        self.times = {'successors': 0.0, 'hashing': 0.0, 'queue': 0.0}
+        self.root_heuristic = None
+        self.solution_cost = None
+        self.f_total = 0
+        self.started = None
+        self.elapsed = None
+
+    def start(self, root):
+        self.root_heuristic = root.get_heuristic()
+        self.started = time.perf_counter()
+
+    def expand(self, state, open_size, closed_size):
+        self.expanded += 1
+        self.f_total += state.get_f()
+        if self.sample_every and self.expanded % self.sample_every == 0:
+            self.samples.append({'expanded': self.expanded, 'open': open_size, 'closed': closed_size,
+                                 'time': time.perf_counter() - self.started})
+
+    def finish(self, goal):
+        self.elapsed = time.perf_counter() - self.started
+        if goal:
+            self.solution_cost = goal.dist
+
+    @contextmanager
+    def timed(self, part):
+        start = time.perf_counter()
+        yield
+        self.times[part] += time.perf_counter() - start
+
+    def to_dict(self):
+        # heuristic accuracy: how much of the optimal cost the root heuristic and the mean expanded f cover
+        cost = self.solution_cost
+        return {
+            'expanded': self.expanded,
+            'generated': self.generated,
+            'duplicates': self.duplicates,
+            'solution_cost': cost,
+            'root_heuristic': self.root_heuristic,
+            'root_heuristic_ratio': self.root_heuristic / cost if cost else None,
+            'mean_expanded_f_ratio': self.f_total / self.expanded / cost if cost and self.expanded else None,
+            'elapsed': self.elapsed,
+            'times': self.times,
+            'samples': self.samples,
+        }
+
+    def to_json(self, path=None):
+        text = json.dumps(self.to_dict(), indent=2)
+        if path:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+
+# (dx, dy, side of the neighbouring tile that faces the cell)
+NEIGHBOURS = ((-1, 0, 'd'), (0, -1, 'r'), (1, 0, 'u'), (0, 1, 'l'))
+OPPOSITE = {'u': 'd', 'r': 'l', 'd': 'u', 'l': 'r'}
+
+
 class Game:
     def __init__(self, n, m, tiles, initial_tile):
         self.n = n
@@ -125,6 +225,41 @@ class Game:
         self.tiles = tiles
         self.initial_tile = initial_tile
         self.best_state = None
+        self.stats = None
+
+        # (side, value) -> tiles whose opposite side has that value
+        self.matching = {}
+        for tile in tiles:
+            for side, opposite in OPPOSITE.items():
+                self.matching.setdefault((side, getattr(tile, opposite)), []).append(tile)
+
+        for tile in tiles:
+            tile.bound = self.get_compatible_bound(tile) if STRONG_HEURISTIC else tile.get_min()
+
+        # bitmasks over tile indices for the dead-end check:
+        # matching_mask[(side, value)] - tiles that fit next to a placed tile showing value on side
+        # open_mask[side] - tiles that some other tile could later match across that side
+        self.matching_mask = {}
+        for key, matches in self.matching.items():
+            for tile in matches:
+                self.matching_mask[key] = self.matching_mask.get(key, 0) | 1 << tile.index
+        self.open_mask = {}
+        for side, facing in OPPOSITE.items():
+            self.open_mask[side] = 0
+            for tile in tiles:
+                # tile's facing side borders the empty cell; a partner there must show that value on its own side
+                if any(t is not tile for t in self.matching.get((facing, getattr(tile, facing)), ())):
+                    self.open_mask[side] |= 1 << tile.index
+
+    def get_compatible_bound(self, tile):
+        # a tile is always placed through an edge some other tile can match,
+        # so its cost is at least the smallest such edge
+        bound = 1e18
+        for side in OPPOSITE:
+            value = getattr(tile, side)
+            if any(t is not tile for t in self.matching.get((side, value), ())):
+                bound = min(bound, value)
+        return bound
     
     def get_neighs(self, state: State):
         neighs = []
@@ -133,28 +268,114 @@ class Game:
                 for j in range(self.m):
                     neighs.append((State(self.n, self.m, state, i, j, self.initial_tile), 0))
         else:
-            not_used_tiles = state.get_unused_tiles()
-            for tile in not_used_tiles:
-                for i, row in enumerate(state.table):
-                    for j, cell in enumerate(row):
-                        if not cell:
-                            cost, ok = state.get_insertion_cost(i, j, tile)
-                            if ok:
-                                s = State(self.n, self.m, state, i, j, tile)
-                                neighs.append((s, cost))
+            placeable = {}
+            for k in state.frontier:
+                i, j = divmod(k, self.m)
+                costs = {}
+                for dx, dy, side in NEIGHBOURS:
+                    a, b = i + dx, j + dy
+                    if 0 <= a < self.n and 0 <= b < self.m:
+                        next_tile = state.get_tile(a, b)
+                        if next_tile:
+                            value = getattr(next_tile, side)
+                            for tile in self.matching.get((side, value), ()):
+                                if state.unused >> tile.index & 1 and value < costs.get(tile, 1e18):
+                                    costs[tile] = value
+
+                for tile, cost in costs.items():
+                    neigh = State(self.n, self.m, state, i, j, tile)
+                    if PRUNE_DEAD_ENDS and self.is_dead_end(state, neigh, k, placeable):
+                        continue
+                    neighs.append((neigh, cost))
 
         return neighs
 
+    def get_placeable(self, board, k):
+        # tiles that can still be placed at empty cell k, now or once a neighbour is filled
+        i, j = divmod(k, self.m)
+        mask = 0
+        for dx, dy, side in NEIGHBOURS:
+            a, b = i + dx, j + dy
+            if 0 <= a < self.n and 0 <= b < self.m:
+                t = board[a * self.m + b]
+                if t < 0:
+                    mask |= self.open_mask[side]
+                else:
+                    mask |= self.matching_mask.get((side, getattr(self.tiles[t], side)), 0)
+        return mask
+
+    def get_counts(self, state):
+        if state.counts is None:
+            counts = [0] * len(self.tiles)
+            for k, t in enumerate(state.board):
+                if t < 0:
+                    mask = self.get_placeable(state.board, k)
+                    for tile in self.tiles:
+                        counts[tile.index] += mask >> tile.index & 1
+            state.counts = tuple(counts)
+        return state.counts
+
+    def is_dead_end(self, state, neigh, k, placeable):
+        # only the filled cell k and its empty neighbours change; a tile is dead once its count hits zero.
+        # placeable caches the parent's cell masks across the successors of one expansion
+        counts = list(self.get_counts(state))
+        i, j = divmod(k, self.m)
+        cells = [k] + [a * self.m + b for a, b in ((i-1, j), (i, j-1), (i+1, j), (i, j+1))
+                       if 0 <= a < self.n and 0 <= b < self.m and neigh.board[a * self.m + b] < 0]
+
+        for cell in cells:
+            if cell not in placeable:
+                placeable[cell] = self.get_placeable(state.board, cell)
+            old = placeable[cell]
+            new = self.get_placeable(neigh.board, cell) if cell != k else 0
+            diff = old ^ new
+            while diff:
+                bit = diff & -diff
+                diff ^= bit
+                if old & bit:
+                    counts[bit.bit_length() - 1] -= 1
+                else:
+                    counts[bit.bit_length() - 1] += 1
+
+        neigh.counts = tuple(counts)
+        # every unused tile is checked, not only those that just lost a cell:
+        # a count can already be zero when get_counts first builds it from scratch
+        if 0 not in counts:
+            return False
+        unused = neigh.unused
+        while unused:
+            bit = unused & -unused
+            unused ^= bit
+            if counts[bit.bit_length() - 1] == 0:
+                return True
+        return False
 
     def search(self):
-        st: List[State] = [State(self.n, self.m)]
-        explored = []
+        if SEARCH == 'ida':
+            return self.ida_search()
+        if SEARCH == 'bounded':
+            return self.ida_search(MEMORY_CAP)
+        if SEARCH == 'hda':
+            return self.hda_search(WORKERS)
+        if SEARCH == 'beam':
+            return self.anytime_beam_search(TIME_LIMIT, BEAM_WIDTH, report_solution)
+        return self.astar_search()
+
+    def astar_search(self):
+        if self.stats:
+            return self.stats_astar_search()
+        start = State(self.n, self.m)
+        st: List[State] = [start]
+        best = {start.board: 0}
+        explored = set()
 
         c = 0
         while st:
-            state = min(st)
-            st.remove(state)
-            explored.append(state)
+            state = heapq.heappop(st)
+            # lazy deletion: skip entries superseded by a cheaper push or already expanded
+            if state.board in explored or state.dist > best[state.board]:
+                continue
+            explored.add(state.board)
             c += 1
 
             # print("State" ,state.get_f(), "\n", state)
@@ -164,21 +385,315 @@ class Game:
                 return state, c
 
             for neigh, weight in self.get_neighs(state):
-                if neigh in st:
-                    for a in st:
-                        if a == neigh:
-                            neigh.dist = a.dist
-
-                if neigh in explored:
+                if neigh.board in explored:
                     continue
-                if state.dist + weight < neigh.dist:
-                    if neigh in st:
-                        st.remove(neigh)
+                if state.dist + weight < best.get(neigh.board, 1e18):
                     neigh.dist = state.dist + weight
-                    st.append(neigh)
+                    best[neigh.board] = neigh.dist
+                    heapq.heappush(st, neigh)
 
         return None
 
+    def stats_astar_search(self):
+        # astar_search with every step timed and counted into self.stats
+        stats = self.stats
+        start = State(self.n, self.m)
+        st: List[State] = [start]
+        best = {start.board: 0}
+        explored = set()
+        stats.start(start)
+
+        c = 0
+        while st:
+            with stats.timed('queue'):
+                state = heapq.heappop(st)
+            with stats.timed('hashing'):
+                stale = state.board in explored or state.dist > best[state.board]
+                if not stale:
+                    explored.add(state.board)
+            if stale:
+                continue
+            c += 1
+            stats.expand(state, len(st), len(explored))
+
+            if state.is_goal():
+                self.best_state = state
+                stats.finish(state)
+                return state, c
+
+            with stats.timed('successors'):
+                neighs = self.get_neighs(state)
+            stats.generated += len(neighs)
+
+            for neigh, weight in neighs:
+                with stats.timed('hashing'):
+                    closed = neigh.board in explored
+                    stats.duplicates += closed or neigh.board in best
+                    improved = not closed and state.dist + weight < best.get(neigh.board, 1e18)
+                if improved:
+                    neigh.dist = state.dist + weight
+                    best[neigh.board] = neigh.dist
+                    with stats.timed('queue'):
+                        heapq.heappush(st, neigh)
+
+        stats.finish(None)
+        return None
+
+    def ida_search(self, memory_cap=0):
+        root = State(self.n, self.m)
+        threshold = root.get_f()
+        c = 0
+
+        while True:
+            # board -> smallest g it was reached with in this iteration
+            table = {}
+            next_threshold = 1e18
+
+            def dfs(root):
+                # explicit stack of child iterators, so deep boards don't hit the recursion limit
+                nonlocal c, next_threshold
+                stack = [iter([root])]
+                while stack:
+                    state = next(stack[-1], None)
+                    if state is None:
+                        stack.pop()
+                        continue
+
+                    f = state.get_f()
+                    if f > threshold:
+                        next_threshold = min(next_threshold, f)
+                        continue
+
+                    if memory_cap:
+                        seen = table.get(state.board)
+                        # an earlier visit with no larger g already searched this subtree
+                        if seen is not None and seen <= state.dist:
+                            continue
+                        if seen is not None or len(table) < memory_cap:
+                            table[state.board] = state.dist
+
+                    c += 1
+                    if state.is_goal():
+                        return state
+
+                    neighs = self.get_neighs(state)
+                    for neigh, weight in neighs:
+                        neigh.dist = state.dist + weight
+                    neighs.sort(key=lambda item: item[0].get_f())
+                    stack.append(iter([neigh for neigh, _ in neighs]))
+                return None
+
+            found = dfs(root)
+            if found:
+                self.best_state = found
+                return found, c
+            if next_threshold >= 1e18:
+                return None
+            threshold = next_threshold
+
+    def hda_search(self, workers):
+        # hash-distributed a*: each board belongs to worker hash(board) % workers
+        ctx = multiprocessing.get_context('fork')
+        inboxes = [ctx.Queue() for _ in range(workers)]
+        results = ctx.Queue()
+        incumbent = ctx.Value('d', 1e18)
+        sent = ctx.Value('q', 0)
+        received = ctx.Value('q', 0)
+        idle = ctx.Array('b', workers, lock=False)
+        expanded = ctx.Array('q', workers, lock=False)
+        stop = ctx.Event()
+
+        root = State(self.n, self.m)
+        first = pickle.dumps([root])
+
+        # daemons, and terminated on any error here, so a failed search never leaves workers behind
+        processes = [ctx.Process(target=hda_worker, daemon=True,
+                                 args=(self, rank, inboxes, results, incumbent, sent, received, idle, expanded, stop))
+                     for rank in range(workers)]
+        for process in processes:
+            process.start()
+
+        def check_workers():
+            # a worker only exits on its own after stop, so a nonzero exit code means it crashed
+            for process in processes:
+                if process.exitcode:
+                    raise RuntimeError(f"hda worker exited with code {process.exitcode}")
+
+        try:
+            with sent.get_lock():
+                sent.value += 1
+            inboxes[hash(root.board) % workers].put(first)
+
+            # terminate once every worker is idle and no batch is in flight.
+            # a worker turns busy before counting a received batch, so stable equal
+            # counters around an all-idle snapshot mean nothing is left to expand
+            while True:
+                time.sleep(0.005)
+                check_workers()
+                before = (sent.value, received.value)
+                if all(idle) and before[0] == before[1] and (sent.value, received.value) == before:
+                    break
+            stop.set()
+
+            best = None
+            if incumbent.value < 1e18:
+                while best is None or best.dist > incumbent.value:
+                    try:
+                        state = pickle.loads(results.get(timeout=0.1))
+                    except queue.Empty:
+                        check_workers()
+                        continue
+                    if best is None or state.dist < best.dist:
+                        best = state
+        except BaseException:
+            stop.set()
+            for process in processes:
+                process.terminate()
+            raise
+        for process in processes:
+            process.join()
+
+        if best is None:
+            return None
+        self.best_state = best
+        return best, sum(expanded)
+
+
+    def beam_search(self, width, deadline=None):
+        # keeps the width best states of every depth; returns (goal, expanded, truncated)
+        layer = [State(self.n, self.m)]
+        truncated = False
+        c = 0
+
+        while layer:
+            if deadline and time.time() > deadline:
+                return None, c, True
+
+            for state in layer:
+                if state.is_goal():
+                    return min(layer, key=lambda s: s.dist), c, truncated
+
+            children = {}
+            for state in layer:
+                c += 1
+                for neigh, weight in self.get_neighs(state):
+                    neigh.dist = state.dist + weight
+                    old = children.get(neigh.board)
+                    if old is None or neigh.dist < old.dist:
+                        children[neigh.board] = neigh
+
+            layer = sorted(children.values(), key=lambda s: s.get_f())
+            if len(layer) > width:
+                layer = layer[:width]
+                truncated = True
+
+        return None, c, truncated
+
+    def anytime_beam_search(self, time_limit, width=16, on_solution=None):
+        deadline = time.time() + time_limit
+        best = None
+        c = 0
+
+        while True:
+            # until some answer is found, passes ignore the deadline so the caller always gets one
+            state, expanded, truncated = self.beam_search(width, deadline if best else None)
+            c += expanded
+            if state and (best is None or state.dist < best.dist):
+                best = state
+                if on_solution:
+                    on_solution(best, width)
+            # an untruncated pass searched every state, so its answer is optimal
+            if not truncated or best and time.time() >= deadline:
+                break
+            width *= 2
+
+        if best is None:
+            return None
+        self.best_state = best
+        return best, c
+
+
+def report_solution(state, width):
+    print(f"beam width {width}: {state.get_f()}", file=sys.stderr)
+
+
+def hda_worker(game, rank, inboxes, results, incumbent, sent, received, idle, expanded, stop):
+    workers = len(inboxes)
+    st: List[State] = []
+    best = {}
+    explored = set()
+    outbox = [[] for _ in range(workers)]
+    # batches left in the inboxes after stop are dropped, so exiting never waits on an unread pipe
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+
+    def receive(batch):
+        # workers don't expand in global f order, so a cheaper path can reach a closed board; reopen it
+        for state in batch:
+            if state.dist < best.get(state.board, 1e18):
+                best[state.board] = state.dist
+                explored.discard(state.board)
+                heapq.heappush(st, state)
+
+    def flush():
+        # batches are pickled here rather than in the queue's feeder thread,
+        # so a bad one kills the worker where hda_search can see it
+        for owner, batch in enumerate(outbox):
+            if batch:
+                with sent.get_lock():
+                    sent.value += 1
+                inboxes[owner].put(pickle.dumps(batch))
+                outbox[owner] = []
+
+    while not stop.is_set():
+        try:
+            while True:
+                batch = pickle.loads(inboxes[rank].get_nowait())
+                idle[rank] = 0
+                with received.get_lock():
+                    received.value += 1
+                receive(batch)
+        except queue.Empty:
+            pass
+
+        while st and (st[0].board in explored or st[0].dist > best[st[0].board]):
+            heapq.heappop(st)
+
+        if not st or st[0].get_f() >= incumbent.value:
+            flush()
+            idle[rank] = 1
+            try:
+                batch = pickle.loads(inboxes[rank].get(timeout=0.01))
+            except queue.Empty:
+                continue
+            idle[rank] = 0
+            with received.get_lock():
+                received.value += 1
+            receive(batch)
+            continue
+
+        idle[rank] = 0
+        state = heapq.heappop(st)
+        explored.add(state.board)
+        expanded[rank] += 1
+
+        if state.is_goal():
+            with incumbent.get_lock():
+                if state.dist < incumbent.value:
+                    incumbent.value = state.dist
+                    results.put(pickle.dumps(state))
+            continue
+
+        for neigh, weight in game.get_neighs(state):
+            neigh.dist = state.dist + weight
+            owner = hash(neigh.board) % workers
+            if owner == rank:
+                receive([neigh])
+            else:
+                outbox[owner].append(neigh)
+        if sum(len(batch) for batch in outbox) >= 64:
+            flush()
+
 
 if __name__ == "__main__":
     n, m = map(int, input().split())
@@ -189,7 +704,11 @@ if __name__ == "__main__":
         TILES.append(Tile(u, r, d, l, i))
 
     game = Game(n, m, TILES, TILES[0])
+    if STATS_FILE:
+        game.stats = SearchStats(STATS_EVERY)
     game.search()
+    if STATS_FILE:
+        game.stats.to_json(STATS_FILE)
     goal =game.best_state
     print(goal.get_f())
     # print(goal)
@@ -0,0 +1,194 @@
+import argparse
+import importlib
+import json
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from contraction import ContractionHierarchy
+
+tintin = importlib.import_module('1')
+INF = tintin.INF
+
+
+def grid_graph(side, max_weight, rng):
+    ids = np.arange(side * side).reshape(side, side)
+    us = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    vs = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    ws = rng.integers(1, max_weight + 1, len(us))
+    return side * side, us, vs, ws
+
+
+def geometric_graph(n, degree, max_weight, rng):
+    # points in the unit square joined when closer than the radius giving ~degree neighbours
+    points = rng.random((n, 2))
+    radius = np.sqrt(degree / (np.pi * n))
+    cells = {}
+    for i, (x, y) in enumerate(points):
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(i)
+
+    us, vs = [], []
+    for (cx, cy), members in cells.items():
+        near = [j for dx in (-1, 0, 1) for dy in (-1, 0, 1) for j in cells.get((cx + dx, cy + dy), [])]
+        for i in members:
+            for j in near:
+                if i < j and np.hypot(*(points[i] - points[j])) < radius:
+                    us.append(i)
+                    vs.append(j)
+    us, vs = np.array(us, dtype=np.int64), np.array(vs, dtype=np.int64)
+    lengths = np.hypot(*(points[us] - points[vs]).T) / radius
+    ws = np.maximum(1, np.ceil(lengths * max_weight)).astype(np.int64)
+    return n, us, vs, ws
+
+
+def power_law_graph(n, degree, max_weight, rng):
+    # barabasi-albert preferential attachment, degree // 2 edges per new node
+    k = max(1, degree // 2)
+    targets = list(range(k))
+    pool = []
+    us, vs = [], []
+    for v in range(k, n):
+        for u in set(targets):
+            us.append(v)
+            vs.append(u)
+        pool += targets + [v] * k
+        targets = [pool[i] for i in rng.integers(0, len(pool), k)]
+    ws = rng.integers(1, max_weight + 1, len(us))
+    return n, np.array(us, dtype=np.int64), np.array(vs, dtype=np.int64), ws
+
+
+GENERATORS = {
+    'grid': lambda n, degree, max_weight, rng: grid_graph(int(np.sqrt(n)), max_weight, rng),
+    'geometric': geometric_graph,
+    'power_law': power_law_graph,
+}
+
+
+class CountingGraph:
+    # every adjacency access is one settled node
+    def __init__(self, graph):
+        self.graph = graph
+        self.settled = 0
+
+    def __len__(self):
+        return len(self.graph)
+
+    def __getitem__(self, v):
+        self.settled += 1
+        return self.graph[v]
+
+
+def measure(function, reset=None):
+    # tracing slows allocation-heavy code, so time one untraced run and take the peak from a second, traced one.
+    # reset() is called before each run to undo the first run's side effects
+    if reset:
+        reset()
+    start = time.perf_counter()
+    result = function()
+    wall = time.perf_counter() - start
+
+    if reset:
+        reset()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, wall, peak
+
+
+def benchmark(kind, n, degree, max_weight, queries, landmarks, criminals, cars, seed):
+    rng = np.random.default_rng(seed)
+    pick = random.Random(seed)
+    n, us, vs, ws = GENERATORS[kind](n, degree, max_weight, rng)
+    graph = tintin.CSRGraph.from_edges(n, us, vs, ws)
+    pairs = [(pick.randrange(n), pick.randrange(n)) for _ in range(queries)]
+    criminals = pick.sample(range(n), min(criminals, n))
+    cars = pick.sample(range(n), min(cars, n))
+
+    report = {'graph': kind, 'nodes': n, 'edges': len(us), 'seed': seed, 'builds': [], 'engines': []}
+
+    alt, wall, peak = measure(lambda: tintin.Landmarks(graph, landmarks))
+    report['builds'].append({'engine': 'alt', 'wall_time': wall, 'peak_memory': peak})
+    ch, wall, peak = measure(lambda: ContractionHierarchy(graph))
+    report['builds'].append({'engine': 'ch', 'wall_time': wall, 'peak_memory': peak})
+
+    counting = CountingGraph(graph)
+
+    def djk_query(**kwargs):
+        def query(s, g):
+            distances, _, _ = tintin.djk(counting, [0 if i == s else INF for i in range(n)], g, **kwargs)
+            return distances[g]
+        return query
+
+    def ch_query(s, g):
+        return ch.query(s, g)[0] if s != g else 0
+
+    engines = {
+        'djk': djk_query(),
+        'djk_radix': djk_query(queue='radix'),
+        'alt': djk_query(landmarks=alt),
+        'ch': ch_query,
+    }
+
+    results = {}
+    for name, query in engines.items():
+        if name == 'ch':
+            ch.up, counting.graph = counting, ch.up
+
+        def run():
+            return [query(s, g) for s, g in pairs]
+
+        def reset():
+            counting.settled = 0
+
+        distances, wall, peak = measure(run, reset)
+        if name == 'ch':
+            ch.up, counting.graph = counting.graph, graph
+        results[name] = [INF if d is None else d for d in distances]
+        report['engines'].append({
+            'engine': name,
+            'queries': len(pairs),
+            'nodes_settled': counting.settled,
+            'settled_per_sec': counting.settled / wall if wall else None,
+            'wall_time': wall,
+            'peak_memory': peak,
+        })
+
+    # the pursuit verdict must agree between the single-pass search and the cached index
+    index, wall, peak = measure(lambda: tintin.CityIndex(graph, criminals, cars))
+    report['builds'].append({'engine': 'city_index', 'wall_time': wall, 'peak_memory': peak})
+    verdicts = {
+        'pursuit': [tintin.pursuit(graph, s, g, criminals, set(cars))[0] for s, g in pairs],
+        'city_index': [index.query(s, g)[0] for s, g in pairs],
+    }
+
+    reference = results['djk']
+    report['mismatches'] = {name: sum(a != b for a, b in zip(reference, distances))
+                            for name, distances in results.items() if name != 'djk'}
+    report['mismatches']['city_index'] = sum(a != b for a, b in zip(verdicts['pursuit'], verdicts['city_index']))
+    report['consistent'] = not any(report['mismatches'].values())
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark HW1 shortest-path engines')
+    parser.add_argument('--graph', choices=sorted(GENERATORS), default='grid')
+    parser.add_argument('--nodes', type=int, default=10000)
+    parser.add_argument('--degree', type=int, default=6)
+    parser.add_argument('--max-weight', type=int, default=100)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--landmarks', type=int, default=8)
+    parser.add_argument('--criminals', type=int, default=3)
+    parser.add_argument('--cars', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    report = benchmark(args.graph, args.nodes, args.degree, args.max_weight, args.queries,
+                       args.landmarks, args.criminals, args.cars, args.seed)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import importlib
+import json
+import random
+
+tiles = importlib.import_module('2')
+
+# (n, m, tiles, most states the pruned search may expand or None) for boards that broke pruning before
+KNOWN = [
+    # open_mask keyed on the wrong side pruned the optimum 9 away
+    (2, 2, [[4, 3, 3, 4], [2, 4, 3, 4], [2, 3, 2, 2], [4, 2, 1, 3]], None),
+    # 9 9 9 9 matches nothing, so the board is dead right after the first placement:
+    # only the root and the n * m first placements may be expanded
+    (2, 3, [[1, 2, 1, 2], [2, 1, 2, 1], [1, 1, 2, 2], [2, 2, 1, 1], [1, 2, 2, 1], [9, 9, 9, 9]], 7),
+]
+
+
+def random_puzzle(n, m, values, rng):
+    return [[rng.randint(1, values) for _ in range(4)] for _ in range(n * m)]
+
+
+def solve(n, m, puzzle, prune):
+    # Game and State read the module globals, so they are set per run
+    tiles.PRUNE_DEAD_ENDS = prune
+    tiles.TILES[:] = [tiles.Tile(*sides, i) for i, sides in enumerate(puzzle)]
+    game = tiles.Game(n, m, tiles.TILES, tiles.TILES[0])
+    game.stats = tiles.SearchStats()
+    result = game.astar_search()
+    return result[0].dist if result else None, game.stats.expanded
+
+
+def check(cases, sizes, values, seed):
+    # dead-end pruning must never change the optimal cost or lose a solution
+    rng = random.Random(seed)
+    puzzles = [(n, m, puzzle, limit) for n, m, puzzle, limit in KNOWN]
+    for _ in range(cases):
+        n, m = rng.choice(sizes)
+        puzzles.append((n, m, random_puzzle(n, m, rng.randint(2, values), rng), None))
+
+    mismatches = []
+    for n, m, puzzle, limit in puzzles:
+        plain, _ = solve(n, m, puzzle, False)
+        pruned, expanded = solve(n, m, puzzle, True)
+        if plain != pruned or limit is not None and expanded > limit:
+            mismatches.append({'n': n, 'm': m, 'tiles': puzzle, 'astar': plain, 'pruned': pruned,
+                               'pruned_expanded': expanded})
+    return {'cases': len(puzzles), 'seed': seed, 'mismatches': mismatches}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='compare tile search costs with and without dead-end pruning')
+    parser.add_argument('--cases', type=int, default=1000)
+    parser.add_argument('--sizes', default='1x3,2x2,1x4,2x3', help='comma separated NxM board sizes')
+    parser.add_argument('--values', type=int, default=4, help='largest edge value')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    sizes = [tuple(map(int, size.split('x'))) for size in args.sizes.split(',')]
+    report = check(args.cases, sizes, args.values, args.seed)
+    print(json.dumps(report, indent=2))
+    if report['mismatches']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
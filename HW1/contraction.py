@@ -0,0 +1,154 @@
+import heapq
+import pickle
+
+INF = 1e18
+
+
+class ContractionHierarchy:
+    def __init__(self, graph, witness_limit=64):
+        # graph is anything indexable like the HW1 adjacency_list: graph[v] -> (u, w) pairs
+        n = len(graph)
+        self.n = n
+        self.witness_limit = witness_limit
+
+        edges = [dict() for _ in range(n)]
+        self.middle = {}
+        for v in range(n):
+            for u, w in graph[v]:
+                if u != v and w < edges[v].get(u, INF):
+                    edges[v][u] = w
+                    edges[u][v] = w
+                    self.middle[(min(u, v), max(u, v))] = -1
+
+        self.rank = [-1] * n
+        self.up = [[] for _ in range(n)]
+        self._contract_all(edges)
+
+    def _witness(self, edges, source, skip, limit):
+        distances = {source: 0}
+        fringe = [(0, source)]
+        settled = 0
+        while fringe and settled < self.witness_limit:
+            g, v = heapq.heappop(fringe)
+            if g > distances[v]:
+                continue
+            if g > limit:
+                break
+            settled += 1
+            for u, w in edges[v].items():
+                if u != skip and g + w < distances.get(u, INF):
+                    distances[u] = g + w
+                    heapq.heappush(fringe, (g + w, u))
+        return distances
+
+    def _shortcuts(self, edges, v):
+        neighbours = list(edges[v].items())
+        shortcuts = []
+        for i, (u, wu) in enumerate(neighbours):
+            others = neighbours[i + 1:]
+            if not others:
+                continue
+            limit = wu + max(w for _, w in others)
+            distances = self._witness(edges, u, v, limit)
+            for x, wx in others:
+                if wu + wx < distances.get(x, INF):
+                    shortcuts.append((u, x, wu + wx))
+        return shortcuts
+
+    def _priority(self, edges, v, deleted):
+        return len(self._shortcuts(edges, v)) - len(edges[v]) + deleted[v]
+
+    def _contract_all(self, edges):
+        deleted = [0] * self.n
+        fringe = [(self._priority(edges, v, deleted), v) for v in range(self.n)]
+        heapq.heapify(fringe)
+
+        order = 0
+        while fringe:
+            _, v = heapq.heappop(fringe)
+            # lazy update: re-evaluate and push back if v is no longer the cheapest
+            priority = self._priority(edges, v, deleted)
+            if fringe and priority > fringe[0][0]:
+                heapq.heappush(fringe, (priority, v))
+                continue
+
+            for u, x, w in self._shortcuts(edges, v):
+                if w < edges[u].get(x, INF):
+                    edges[u][x] = w
+                    edges[x][u] = w
+                    self.middle[(min(u, x), max(u, x))] = v
+
+            self.rank[v] = order
+            order += 1
+            for u, w in edges[v].items():
+                self.up[v].append((u, w))
+                del edges[u][v]
+                deleted[u] += 1
+            edges[v] = {}
+
+    def _unpack(self, a, b):
+        path = [a]
+        stack = [(a, b)]
+        while stack:
+            a, b = stack.pop()
+            mid = self.middle[(min(a, b), max(a, b))]
+            if mid == -1:
+                path.append(b)
+            else:
+                stack.append((mid, b))
+                stack.append((a, mid))
+        return path
+
+    def query(self, s, g):
+        if s == g:
+            return 0, [s]
+
+        distances = ({s: 0}, {g: 0})
+        parents = ({s: -1}, {g: -1})
+        fringes = ([(0, s)], [(0, g)])
+        best, meet = INF, -1
+
+        while True:
+            # expand the side with the smaller key; a side is done once its key reaches best
+            live = [i for i in (0, 1) if fringes[i] and fringes[i][0][0] < best]
+            if not live:
+                break
+            side = min(live, key=lambda i: fringes[i][0][0])
+
+            d, v = heapq.heappop(fringes[side])
+            if d > distances[side][v]:
+                continue
+
+            other = distances[1 - side].get(v)
+            if other is not None and d + other < best:
+                best, meet = d + other, v
+
+            for u, w in self.up[v]:
+                if d + w < distances[side].get(u, INF):
+                    distances[side][u] = d + w
+                    parents[side][u] = v
+                    heapq.heappush(fringes[side], (d + w, u))
+
+        if meet == -1:
+            return None, None
+
+        head = [meet]
+        v = meet
+        while parents[0][v] != -1:
+            head += self._unpack(v, parents[0][v])[1:]
+            v = parents[0][v]
+        path = head[::-1]
+        v = meet
+        while parents[1][v] != -1:
+            path += self._unpack(v, parents[1][v])[1:]
+            v = parents[1][v]
+        return best, path
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
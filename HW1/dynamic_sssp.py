@@ -0,0 +1,88 @@
+import heapq
+
+INF = 1e18
+
+
+class DynamicField:
+    # multi-source shortest-path field; sources are seeded with their own initial distance
+    def __init__(self, graph, seeds, coeff=1):
+        n = len(graph)
+        self.graph = graph
+        self.coeff = coeff
+        self.seeds = {}
+        self.distances = [INF] * n
+        self.parents = [-1] * n
+
+        fringe = []
+        for v, d in seeds.items():
+            self.seeds[v] = d
+            if d < self.distances[v]:
+                self.distances[v] = d
+                fringe.append((d, v))
+        heapq.heapify(fringe)
+        self._propagate(fringe, set())
+
+    def _propagate(self, fringe, changed):
+        distances, parents = self.distances, self.parents
+        while fringe:
+            g, v = heapq.heappop(fringe)
+            if g > distances[v]:
+                continue
+            for u, w in self.graph[v]:
+                if g + w * self.coeff < distances[u]:
+                    distances[u] = g + w * self.coeff
+                    parents[u] = v
+                    changed.add(u)
+                    heapq.heappush(fringe, (distances[u], u))
+        return changed
+
+    def _subtree(self, v):
+        affected = {v}
+        stack = [v]
+        while stack:
+            x = stack.pop()
+            for u, _ in self.graph[x]:
+                if self.parents[u] == x and u not in affected:
+                    affected.add(u)
+                    stack.append(u)
+        return affected
+
+    def _repair(self, v):
+        # only the shortest-path subtree hanging off v's seed can get worse
+        if self.parents[v] != -1 or self.distances[v] == INF:
+            return set()
+
+        affected = self._subtree(v)
+        distances, parents = self.distances, self.parents
+        for x in affected:
+            distances[x] = self.seeds.get(x, INF)
+            parents[x] = -1
+
+        fringe = []
+        for x in affected:
+            for u, w in self.graph[x]:
+                if u not in affected and distances[u] + w * self.coeff < distances[x]:
+                    distances[x] = distances[u] + w * self.coeff
+                    parents[x] = u
+            if distances[x] < INF:
+                fringe.append((distances[x], x))
+        heapq.heapify(fringe)
+        return self._propagate(fringe, affected)
+
+    def set_source(self, v, d):
+        old = self.seeds.get(v)
+        self.seeds[v] = d
+        if old is not None and d > old:
+            return self._repair(v)
+
+        if d >= self.distances[v]:
+            return set()
+        self.distances[v] = d
+        self.parents[v] = -1
+        return self._propagate([(d, v)], {v})
+
+    def remove_source(self, v):
+        if v not in self.seeds:
+            return set()
+        del self.seeds[v]
+        return self._repair(v)
@@ -0,0 +1,167 @@
+import json
+
+import numpy as np
+
+from prefix_cache import SNAPSHOT
+
+MOVES = {'w': (0, -1), 'a': (-1, 0), 's': (0, 1), 'd': (1, 0), 'x': (0, 0)}
+DX = np.zeros(256, dtype=np.int64)
+DY = np.zeros(256, dtype=np.int64)
+for move, (dx, dy) in MOVES.items():
+    DX[ord(move)], DY[ord(move)] = dx, dy
+
+
+class Point:
+    def __init__(self, x, y, width=0, height=0, vel=0):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.vel = vel
+
+
+class Line:
+    def __init__(self, x1, y1, x2, y2):
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+
+
+class HeadlessGame:
+    # same attributes the GA reads from hardest_game.Game, without any graphics.
+    # map spec (json): player {x, y, width, height, vel}, end {x, y, width, height},
+    # Mlines / Vlines [[x1, y1, x2, y2]], goals [[x, y]], enemy_radius and
+    # enemies [{x, y, dx, dy, period}] patrolling back and forth every period steps
+    def __init__(self, spec):
+        p = spec['player']
+        self.player = Point(p['x'], p['y'], p['width'], p['height'], p['vel'])
+        e = spec['end']
+        self.end = Point(e['x'], e['y'], e['width'], e['height'])
+        self.Mlines = [Line(*l) for l in spec['Mlines']]
+        self.Vlines = [Line(*l) for l in spec['Vlines']]
+        self.goals = [[Point(x, y)] for x, y in spec['goals']]
+        self.enemy_radius = spec['enemy_radius']
+
+        self.m = np.array(spec['Mlines'], dtype=np.float64).reshape(-1, 4)
+        self.v = np.array(spec['Vlines'], dtype=np.float64).reshape(-1, 4)
+        self.goal_xy = np.array(spec['goals'], dtype=np.float64).reshape(-1, 2)
+        self.enemy_start = np.array([[en['x'], en['y']] for en in spec['enemies']], dtype=np.float64).reshape(-1, 2)
+        self.enemy_step = np.array([[en['dx'], en['dy']] for en in spec['enemies']], dtype=np.float64).reshape(-1, 2)
+        self.enemy_period = np.array([en['period'] for en in spec['enemies']], dtype=np.int64)
+
+        self.players = []
+        self.goal_player = np.zeros((len(self.goals), 0), dtype=bool)
+        self.enemies = self.get_enemies(0)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def enemy_positions(self, t):
+        # triangle wave: forward for period steps, then back
+        phase = t % (2 * self.enemy_period)
+        k = np.where(phase <= self.enemy_period, phase, 2 * self.enemy_period - phase)
+        return self.enemy_start + k[:, None] * self.enemy_step
+
+    def get_enemies(self, t):
+        return [Point(x, y) for x, y in self.enemy_positions(t).tolist()]
+
+    def blocked(self, x, y, dx, dy):
+        # vectorized interval tests of every player against every wall, same rules as bfs in q2.py
+        w, h, vel = self.player.width, self.player.height, self.player.vel
+        x, y = x[:, None], y[:, None]
+        mx1, my1, my2 = self.m[:, 0], self.m[:, 1], self.m[:, 3]
+        vx1, vy1, vx2 = self.v[:, 0], self.v[:, 1], self.v[:, 2]
+        rows = (y + h > my1) & (y < my2)
+        cols = (x + w > vx1) & (x < vx2)
+        right = (rows & (x + w <= mx1) & (mx1 < x + w + vel)).any(axis=1)
+        left = (rows & (x >= mx1) & (mx1 > x - vel)).any(axis=1)
+        down = (cols & (y + h <= vy1) & (vy1 < y + h + vel)).any(axis=1)
+        up = (cols & (y >= vy1) & (vy1 > y - vel)).any(axis=1)
+        return ((dx > 0) & right) | ((dx < 0) & left) | ((dy > 0) & down) | ((dy < 0) & up)
+
+    def step(self, idx, moves, t):
+        w, h, vel = self.player.width, self.player.height, self.player.vel
+        x, y = self.x[idx], self.y[idx]
+        dx, dy = DX[moves], DY[moves]
+        free = ~self.blocked(x, y, dx, dy)
+        x = np.where(free, x + dx * vel, x)
+        y = np.where(free, y + dy * vel, y)
+        self.x[idx], self.y[idx] = x, y
+
+        if len(self.goal_xy):
+            gx, gy = self.goal_xy[:, 0], self.goal_xy[:, 1]
+            inside = (x[:, None] <= gx) & (gx <= x[:, None] + w) & (y[:, None] <= gy) & (gy <= y[:, None] + h)
+            self.collected[idx] |= inside
+
+        if len(self.enemy_start):
+            enemies = self.enemy_positions(t + 1)
+            ex, ey = enemies[:, 0], enemies[:, 1]
+            nx = np.clip(ex, x[:, None], x[:, None] + w) - ex
+            ny = np.clip(ey, y[:, None], y[:, None] + h) - ey
+            hit = (nx * nx + ny * ny < self.enemy_radius ** 2).any(axis=1)
+            self.died[idx[hit]] = t
+
+        cx, cy = x + w / 2, y + h / 2
+        end = self.end
+        at_end = (end.x <= cx) & (cx <= end.x + end.width) & (end.y <= cy) & (cy <= end.y + end.height)
+        won = at_end & self.collected[idx].all(axis=1) & (self.died[idx] < 0)
+        self.won[idx[won]] = True
+
+    def snapshot(self, rows):
+        # one batch of array slices per chunk boundary; trie nodes hold (batch, row) into it
+        return self.x[rows], self.y[rows], self.died[rows], self.won[rows], self.collected[rows]
+
+    def resume(self, list_of_moves, cache):
+        # players restart from the deepest cached prefix; returns their start moves and trie nodes
+        start = np.zeros(len(list_of_moves), dtype=np.int64)
+        nodes = []
+        batches = {}
+        for i, moves_i in enumerate(list_of_moves):
+            depth, snapshot, node = cache.lookup_node(moves_i)
+            nodes.append(node)
+            if snapshot is not None:
+                start[i] = depth
+                batch, row = snapshot
+                batches.setdefault(id(batch), (batch, [], []))
+                batches[id(batch)][1].append(i)
+                batches[id(batch)][2].append(row)
+        for batch, players, rows in batches.values():
+            self.x[players], self.y[players], self.died[players], self.won[players], self.collected[players] = (
+                part[rows] for part in batch)
+        return start, nodes
+
+    def run_generation(self, list_of_moves, move_len, cache=None):
+        n = len(list_of_moves)
+        moves = np.frombuffer(''.join(list_of_moves).encode(), dtype=np.uint8).reshape(n, move_len)
+        self.x = np.full(n, self.player.x, dtype=np.float64)
+        self.y = np.full(n, self.player.y, dtype=np.float64)
+        self.died = np.full(n, -1, dtype=np.int64)
+        self.won = np.zeros(n, dtype=bool)
+        self.collected = np.zeros((n, len(self.goals)), dtype=bool)
+
+        start = np.zeros(n, dtype=np.int64)
+        if cache:
+            start, nodes = self.resume(list_of_moves, cache)
+
+        for t in range(int(start.min()) if n else move_len, move_len):
+            idx = np.flatnonzero((start <= t) & (self.died < 0) & ~self.won)
+            if len(idx):
+                self.step(idx, moves[idx, t], t)
+
+            if cache and (t + 1) % cache.chunk == 0:
+                rows = np.flatnonzero(start <= t)
+                batch = self.snapshot(rows) if cache.should_store(t + 1) else None
+                for row, i in enumerate(rows.tolist()):
+                    nodes[i] = cache.child(nodes[i], list_of_moves[i][t + 1 - cache.chunk:t + 1])
+                    if batch:
+                        nodes[i][SNAPSHOT] = batch, row
+
+        w, h, vel = self.player.width, self.player.height, self.player.vel
+        self.players = [[Point(x, y, w, h, vel), died, won]
+                        for x, y, died, won in zip(self.x.tolist(), self.y.tolist(), self.died.tolist(), self.won.tolist())]
+        self.goal_player = self.collected.T
+        self.enemies = self.get_enemies(move_len)
+        return self
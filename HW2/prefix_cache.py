@@ -0,0 +1,48 @@
+CHILDREN, SNAPSHOT, STAMP = 0, 1, 2
+
+
+class PrefixCache:
+    # trie over fixed-size move chunks; a node can hold a snapshot of the simulation
+    # right after its prefix, so a genome only re-simulates the suffix past its deepest hit
+    def __init__(self, chunk, stride=1, keep=1):
+        self.chunk = chunk
+        self.stride = stride
+        self.keep = keep
+        self.generation = 0
+        self.root = [{}, None, 0]
+
+    def lookup_node(self, moves):
+        # (number of moves covered, snapshot, trie node) for the longest cached prefix of moves;
+        # the simulator keeps descending from that node with child()
+        node = self.root
+        depth, snapshot, found = 0, None, self.root
+        for start in range(0, len(moves) - self.chunk + 1, self.chunk):
+            node = node[CHILDREN].get(moves[start:start + self.chunk])
+            if node is None:
+                break
+            node[STAMP] = self.generation
+            if node[SNAPSHOT] is not None:
+                depth, snapshot, found = start + self.chunk, node[SNAPSHOT], node
+        return depth, snapshot, found
+
+    def child(self, node, key):
+        child = node[CHILDREN].get(key)
+        if child is None:
+            child = node[CHILDREN][key] = [{}, None, self.generation]
+        child[STAMP] = self.generation
+        return child
+
+    def should_store(self, depth):
+        return depth > 0 and depth % (self.chunk * self.stride) == 0
+
+    def next_generation(self):
+        # forget prefixes nobody looked up or stored during the last keep generations
+        self.generation += 1
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            children = node[CHILDREN]
+            for key in [key for key, child in children.items() if child[STAMP] < self.generation - self.keep]:
+                del children[key]
+            stack.extend(children.values())
+
@@ -1,25 +1,39 @@
-import random
+import hashlib
+import os
+import pickle
+from collections import deque
 from math import sqrt
 
-import hardest_game
+import numpy as np
+
+# hardest_game (graphics) is imported where it is used, so headless mode runs without it
+from headless_game import HeadlessGame
+from prefix_cache import PrefixCache
+from selection import select_parents
 
 
 def play_game_AI(str, map_name='map1.txt'):
+    import hardest_game
     game = hardest_game.Game(map_name=map_name, game_type='AI').run_AI_moves_graphic(moves=str)
     return game
 
 
 def simulate(str, map_name='map1.txt'):
+    import hardest_game
     game = hardest_game.Game(map_name=map_name, game_type='AI').run_AI_moves_no_graphic(moves=str)
     return game
 
 
 def run_whole_generation(list_of_strs, N, map_name='map1.txt'):
+    if headless:
+        return headless.run_generation(list_of_strs, N, prefix_cache)
+    import hardest_game
     game = hardest_game.Game(map_name=map_name, game_type='AIS').run_generation(list_of_moves=list_of_strs, move_len=N)
     return game
 
 
 def play_human_mode(map_name='map1.txt'):
+    import hardest_game
     hardest_game.Game(map_name=map_name, game_type='player').run_player_mode()
 
 
@@ -28,38 +42,45 @@ max_pop = 1000
 mutation_rate = 0.1
 ngen = 3000
 gene_pool = ['w', 'a', 's', 'd', 'x']
+map_name = 'map1.txt'
+headless_map = None  # json map spec for the in-repo HeadlessGame (e.g. 'headless_map.json'); None runs hardest_game
+selection_strategy = 'roulette'  # roulette, sus or tournament
+cache_prefixes = False  # headless only: resume genomes from cached move prefixes; pays off on long genomes
 
 
-def init_population(max_population, gene_pool, length):
-    g = len(gene_pool)
-    population = []
-    for i in range(max_population):
-        new_individual = [gene_pool[random.randrange(0, g)] for j in range(length)]
-        population.append(new_individual)
+rng = np.random.default_rng()
+headless = HeadlessGame.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), headless_map)) if headless_map else None
+# coarse chunks: walking the trie per genome costs more than it saves below ~100 moves a chunk
+prefix_cache = PrefixCache(100) if headless and cache_prefixes else None
 
-    return population
 
+# individuals are rows of a (pop, length) uint8 matrix of indices into gene_pool
+def init_population(max_population, gene_pool, length):
+    return rng.integers(0, len(gene_pool), (max_population, length), dtype=np.uint8)
 
-population = init_population(max_pop, gene_pool, length * 2)
 
+def decode(population, gene_pool):
+    chars = np.frombuffer(''.join(gene_pool).encode(), dtype=np.uint8)
+    rows = np.ascontiguousarray(chars[population]).view(f'S{population.shape[1]}').ravel()
+    return [row.decode() for row in rows]
 
-def mutate(x, gene_pool, pmut):
-    if random.uniform(0, 1) >= pmut:
-        return x
 
-    n = len(x)
-    g = len(gene_pool)
-    c = random.randrange(0, n)
-    r = random.randrange(0, g)
+population = init_population(max_pop, gene_pool, length * 2)
+
 
-    new_gene = gene_pool[r]
-    return x[:c] + [new_gene] + x[c + 1:]
+def mutate(population, gene_pool, pmut):
+    # each individual mutates one random gene with probability pmut
+    rows = np.flatnonzero(rng.random(len(population)) < pmut)
+    cols = rng.integers(0, population.shape[1], len(rows))
+    population[rows, cols] = rng.integers(0, len(gene_pool), len(rows), dtype=np.uint8)
+    return population
 
 
 def recombine(x, y):
-    n = len(x)
-    c = random.randrange(0, n)
-    return x[:c] + y[c:]
+    # one-point crossover of every row pair: x[:c] + y[c:]
+    n = x.shape[1]
+    c = rng.integers(0, n, len(x))
+    return np.where(np.arange(n) < c[:, None], x, y)
 
 
 def get_dist(x1, y1, x2, y2):
@@ -97,122 +118,145 @@ def fn(game, i, a):
     return point
 
 
+def sorted_field(a):
+    # the distance field as sorted key / value arrays for searchsorted lookups
+    keys = np.fromiter(a.keys(), dtype=np.int64, count=len(a))
+    values = np.fromiter(a.values(), dtype=np.float64, count=len(a))
+    order = np.argsort(keys)
+    return keys[order], values[order]
+
+
+def batch_fn(game, field):
+    # fn for every player at once; terms are added in fn's order so the scores are identical
+    keys, values = field
+    players = game.players
+    x = np.array([p[0].x for p in players], dtype=np.float64)
+    y = np.array([p[0].y for p in players], dtype=np.float64)
+    died = np.array([p[1] for p in players])
+    won = np.array([p[2] for p in players], dtype=bool)
+    width, height = players[0][0].width, players[0][0].height
+    cx, cy = x + width / 2, y + height / 2
+
+    key = (1009 * x + y).astype(np.int64)
+    pos = np.minimum(np.searchsorted(keys, key), len(keys) - 1)
+    missing = (keys[pos] != key) | (key != 1009 * x + y)
+    if missing.any():
+        raise KeyError(1009 * x[missing][0] + y[missing][0])
+    point = np.zeros(len(players))
+    point -= values[pos] * 10
+    for j in range(len(game.goals)):
+        goal = game.goals[j][0]
+        collected = np.asarray(game.goal_player[j][:len(players)], dtype=bool)
+        dist = np.sqrt((goal.x - cx) * (goal.x - cx) + (goal.y - cy) * (goal.y - cy))
+        point = np.where(collected, point + 400, point - dist * 5)
+    for enemy in game.enemies:
+        dist = np.sqrt((enemy.x - cx) * (enemy.x - cx) + (enemy.y - cy) * (enemy.y - cy))
+        point = np.where(dist < 25, point - 50, point)
+    point = np.where(won, point + 100000000000, point)
+    point = np.where(died != -1, point - 30000, point)
+    return point
+
+
 def sf(a):
     return a[0]
 
 
-def select(r, population, fitnesses):
-    selected = list()
-    min_fitness = fitnesses[-1]
-    fitnesses_sum = sum(fitnesses) - min_fitness * len(fitnesses)
-    diff = fitnesses[0] - min_fitness
-    for i in range(r):
-        if fitnesses_sum == 0:
-            selected.append(random.choice(population))
-            continue
-        prob = random.random()
-        t = False
-        for j in range(len(fitnesses)):
-            if prob < diff / fitnesses_sum:
-                selected.append(population[j])
-                t = True
-                break
-            diff += (fitnesses[j] - min_fitness)
-        if not t:
-            selected.append(population[-1])
-    return tuple(selected)
+def wall_index(game):
+    # walls bucketed by the lattice column/row (relative to the end cell) whose move they block,
+    # so each move only tests the few walls in its own bucket
+    player = game.player
+    w, h, vel = player.width, player.height, player.vel
+    ex, ey = game.end.x, game.end.y
+    right, left, down, up = {}, {}, {}, {}
+    for l in game.Mlines:
+        right.setdefault((l.x1 - w - ex) // vel, []).append((l.y1, l.y2))
+        left.setdefault(-((ex - l.x1) // vel), []).append((l.y1, l.y2))
+    for l in game.Vlines:
+        down.setdefault((l.y1 - h - ey) // vel, []).append((l.x1, l.x2))
+        up.setdefault(-((ey - l.y1) // vel), []).append((l.x1, l.x2))
+    return right, left, down, up
 
 
 def bfs(game):
     a = dict()
-    q = list()
-    q.append([game.end.x, game.end.y])
-    a[1009 * game.end.x + game.end.y] = 0
-    end = game.end
     player = game.player
-    while len(q) > 0:
-        s = q.pop(0)
-        t1 = False
-        for l in game.Mlines:
-            if s[1] + player.height > l.y1 and s[1] < l.y2 and s[0] + player.width <= l.x1 < s[
-                0] + player.vel + player.width:
-                t1 = True
-                break
-        if not t1:
-            new_x = s[0] + player.vel
-            new_y = s[1]
-            new = new_x * 1009 + new_y
-            if new not in a.keys():
-                q.append([new_x, new_y])
-                a[new] = a[1009 * s[0] + s[1]] + 1
-        t1 = False
-        for l in game.Mlines:
-            if s[1] + player.height > l.y1 and s[1] < l.y2 and s[0] >= l.x1 > s[0] - player.vel:
-                t1 = True
-                break
-        if not t1:
-            new_x = s[0] - player.vel
-            new_y = s[1]
-            new = new_x * 1009 + new_y
-            if new not in a.keys():
-                q.append([new_x, new_y])
-                a[new] = a[1009 * s[0] + s[1]] + 1
-        t1 = False
-        for l in game.Vlines:
-            if s[0] + player.width > l.x1 and s[0] < l.x2 and s[1] + player.height <= l.y1 < s[
-                1] + player.vel + player.height:
-                t1 = True
-                break
-        if not t1:
-            new_x = s[0]
-            new_y = s[1] + player.vel
-            new = new_x * 1009 + new_y
-            if new not in a.keys():
-                q.append([new_x, new_y])
-                a[new] = a[1009 * s[0] + s[1]] + 1
-        t1 = False
-        for l in game.Vlines:
-            if s[0] + player.width > l.x1 and s[0] < l.x2 and s[1] >= l.y1 > s[1] - player.vel:
-                t1 = True
-                break
-        if not t1:
-            new_x = s[0]
-            new_y = s[1] - player.vel
-            new = new_x * 1009 + new_y
-            if new not in a.keys():
-                q.append([new_x, new_y])
-                a[new] = a[1009 * s[0] + s[1]] + 1
+    w, h, vel = player.width, player.height, player.vel
+    ex, ey = game.end.x, game.end.y
+    right, left, down, up = wall_index(game)
+
+    def blocked(walls, lo, size):
+        return any(lo + size > a1 and lo < a2 for a1, a2 in walls)
+
+    q = deque([(0, 0)])
+    a[1009 * ex + ey] = 0
+    while q:
+        i, j = q.popleft()
+        x, y = ex + i * vel, ey + j * vel
+        d = a[1009 * x + y] + 1
+        for di, dj, walls, lo, size in ((1, 0, right.get(i, ()), y, h), (-1, 0, left.get(i, ()), y, h),
+                                        (0, 1, down.get(j, ()), x, w), (0, -1, up.get(j, ()), x, w)):
+            if blocked(walls, lo, size):
+                continue
+            new = 1009 * (x + di * vel) + y + dj * vel
+            if new not in a:
+                a[new] = d
+                q.append((i + di, j + dj))
     return a
 
 
+distance_fields = {}
+
+
+def field_digest(game):
+    # everything bfs reads: walls, the end cell and the player's size and speed
+    player = game.player
+    inputs = ([(l.x1, l.y1, l.x2, l.y2) for l in game.Mlines], [(l.x1, l.y1, l.x2, l.y2) for l in game.Vlines],
+              game.end.x, game.end.y, player.width, player.height, player.vel)
+    return hashlib.sha1(repr(inputs).encode()).hexdigest()[:16]
+
+
+def get_distance_field(game, map_name):
+    # the map and its end are static, so the field is computed once and kept on disk,
+    # under a digest of the bfs inputs so an edited map never reuses a stale field
+    name = f'{os.path.basename(map_name)}-{field_digest(game)}.pkl'
+    if name not in distance_fields:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'distance_fields', name)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                distance_fields[name] = pickle.load(f)
+        else:
+            distance_fields[name] = bfs(game)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                pickle.dump(distance_fields[name], f)
+    return distance_fields[name]
+
+
 def genetic_algorithm_stepwise(population):
     best_gens = []
     best_scores = []
     l = length * 2
+    field = None
     for generation in range(ngen):
         print(generation)
         if generation % 4 == 3:
-            pop2 = init_population(max_pop, gene_pool, length)
-            for i in range(max_pop):
-                population[i] = population[i] + pop2[i]
+            population = np.hstack([population, init_population(max_pop, gene_pool, length)])
             l += length
-        game = run_whole_generation(population, l)
-        a = bfs(game)
-        scores = list()
-        for i in range(max_pop):
-            scores.append([fn(game, i, a), i])
-        scores = sorted(scores, reverse=True)
-        population_sorted = list()
-        fitnesses = list()
-        for i in range(max_pop):
-            population_sorted.append(population[scores[i][1]])
-            fitnesses.append(scores[i][0])
-
-        population = population_sorted
-        population = [
-            mutate(recombine(*select(2, population, fitnesses)), gene_pool, mutation_rate) for i
-            in range(len(population))]
-        members = [''.join(x) for x in population][:48]
+        game = run_whole_generation(decode(population, gene_pool), l, map_name)
+        if field is None:
+            # keyed on the map actually simulated, which is the json spec in headless mode
+            field = sorted_field(get_distance_field(game, headless_map or map_name))
+        scores = batch_fn(game, field)[:max_pop]
+        # best first, ties to the higher index, as sorted([score, i], reverse=True) did
+        order = np.lexsort((np.arange(max_pop), scores))[::-1]
+        fitnesses = scores[order]
+
+        population = population[order]
+        parents = select_parents(fitnesses, max_pop, rng, selection_strategy)
+        population = mutate(recombine(population[parents[:, 0]], population[parents[:, 1]]), gene_pool, mutation_rate)
+        members = decode(population[:48], gene_pool)
+        if prefix_cache:
+            prefix_cache.next_generation()
 
 
 # play_human_mode()
@@ -0,0 +1,49 @@
+import numpy as np
+
+
+def _weights(fitnesses):
+    # roulette weights are fitnesses shifted so the worst individual gets zero
+    fitnesses = np.asarray(fitnesses, dtype=np.float64)
+    return fitnesses - fitnesses.min()
+
+
+def roulette(fitnesses, k, rng):
+    weights = _weights(fitnesses)
+    total = weights.sum()
+    if total == 0:
+        return rng.integers(0, len(weights), k)
+    cumulative = np.cumsum(weights)
+    return np.searchsorted(cumulative, rng.random(k) * total, side='right')
+
+
+def stochastic_universal(fitnesses, k, rng):
+    # k evenly spaced pointers with one random offset; shuffled so consecutive picks are unrelated
+    weights = _weights(fitnesses)
+    total = weights.sum()
+    if total == 0:
+        return rng.integers(0, len(weights), k)
+    cumulative = np.cumsum(weights)
+    step = total / k
+    pointers = rng.random() * step + np.arange(k) * step
+    picks = np.searchsorted(cumulative, pointers, side='right')
+    rng.shuffle(picks)
+    return picks
+
+
+def tournament(fitnesses, k, rng, size=3):
+    fitnesses = np.asarray(fitnesses)
+    candidates = rng.integers(0, len(fitnesses), (k, size))
+    return candidates[np.arange(k), np.argmax(fitnesses[candidates], axis=1)]
+
+
+STRATEGIES = {
+    'roulette': roulette,
+    'sus': stochastic_universal,
+    'tournament': tournament,
+}
+
+
+def select_parents(fitnesses, n, rng, strategy='roulette'):
+    # parent index pairs for n children, shape (n, 2)
+    picks = STRATEGIES[strategy](fitnesses, 2 * n, rng)
+    return np.minimum(picks, len(fitnesses) - 1).reshape(n, 2)